@@ -18,13 +18,135 @@ from .utils.grid_utils import MartheGrid
 
 encoding = 'latin-1'
 dmv = [-9999., 0., 9999] # Default field masked values
+group_stats = ['count', 'sum', 'mean', 'min', 'max', 'std', 'var'] # Vectorized group statistics
+
+
+
+def get_group_stats(values, gid, ngroups, stats):
+    """
+    Perform statistics on values gathered by integer group ids
+    in a few vectorized passes (no python loop over groups).
+    NaN values are ignored (as pandas.DataFrame.agg() does).
+
+    Parameters:
+    ----------
+    values (1D-array) : values to aggregate.
+    gid (1D-array) : group id (0 <= gid < ngroups) of each value.
+    ngroups (int) : number of groups.
+    stats (list) : statistic names to compute.
+                   Must be in `group_stats`.
+
+    Returns:
+    --------
+    res (dict) : computed statistics.
+                 Format: {stat_0: 1D-array (ngroups), ...}
+
+    Examples:
+    --------
+    layers, gid = np.unique(df['layer'], return_inverse=True)
+    res = get_group_stats(df['value'].to_numpy(), gid, len(layers), ['mean', 'max'])
+    """
+    # ---- Ignore NaN values
+    valid = ~np.isnan(values)
+    v, g = values[valid], gid[valid]
+
+    # ---- Compute moments once
+    count = np.bincount(g, minlength=ngroups)
+    vsum = np.bincount(g, weights=v, minlength=ngroups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = vsum / count
+
+    # ---- Fetch required statistics
+    res = {}
+    for stat in stats:
+        if stat == 'count':
+            res[stat] = count
+        elif stat == 'sum':
+            res[stat] = vsum
+        elif stat == 'mean':
+            res[stat] = mean
+        elif stat in ['std', 'var']:
+            # -- Unbiased estimator (ddof = 1, as pandas)
+            ss = np.bincount(g, weights=(v - mean[g])**2, minlength=ngroups)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                var = np.where(count > 1, ss / (count - 1), np.nan)
+            res[stat] = var if stat == 'var' else np.sqrt(var)
+        elif stat in ['min', 'max']:
+            arr = np.full(ngroups, np.nan)
+            ufunc = np.fmin if stat == 'min' else np.fmax
+            ufunc.at(arr, g, v)
+            res[stat] = arr
+
+    # ---- Return statistics
+    return res
+
+
+
+# ---- Field data (rec.array) shared by all animation frames of a process
+_frame_base = None
+
+
+def _set_frame_base(base, backend=None):
+    """
+    Set field data shared by all animation frames of the current process
+    (also used as multiprocessing workers initializer).
+
+    Parameters:
+    ----------
+    base (rec.array) : field data (geometry) of all frames.
+    backend (str, optional) : matplotlib backend to switch to.
+                              Default is None (unchanged).
+    """
+    global _frame_base
+    _frame_base = base
+    if backend is not None:
+        plt.switch_backend(backend)
+
+
+
+def _save_frame(args):
+    """
+    Plot a single MartheField as an animation frame and save it as image.
+    Defined at module level to be picklable by multiprocessing workers.
+    The frame field data is only built here, from the shared field
+    data (see _set_frame_base()) and the frame values.
+
+    Parameters:
+    ----------
+    args (tuple) : (mf, values, text, png, dpi, kwargs)
+                    - mf (MartheField) : field to plot (without data).
+                    - values (1D-array) : field values of the frame.
+                    - text (str) : time reference to add (top left).
+                    - png (str) : image file to write.
+                    - dpi (int) : image resolution.
+                    - kwargs (dict) : MartheField.plot arguments.
+
+    Returns:
+    --------
+    png (str) : written image file.
+    """
+    mf, values, text, png, dpi, kwargs = args
+    # ---- Build frame field data
+    mf._data = _frame_base.copy()
+    mf._data['value'] = values
+    # ---- Plot MartheField
+    ax = mf.plot(**kwargs)
+    # ---- Add time reference (top left)
+    ax.text(0.01, 0.94, text, fontsize = 7.5, transform=ax.transAxes)
+    # ---- Save plot as image and release figure
+    fig = ax.get_figure()
+    fig.savefig(png, dpi=dpi)
+    plt.close(fig)
+    # ---- Return image file
+    return png
+
 
 
 class MartheField():
     """
     Wrapper Marthe --> python
     """
-    def __init__(self, field, data, mm, use_imask=True):
+    def __init__(self, field, data, mm, use_imask=True, value_dtype=None):
         """
         Marthe gridded property instance.
 
@@ -55,6 +177,15 @@ class MartheField():
                                      Note : an 'independent field' contains both the 
                                             field data and active domain (geometry)
                                             when a 'related field' only contains data.
+
+        value_dtype (dtype, optional) : numeric type used to store field values.
+                                        Setting np.float32 halves the memory footprint
+                                        of the `value` column and speeds up memory-bound
+                                        processes (plot, log10, zonal statistics, ...).
+                                        Values out of the required dtype range are kept
+                                        in their original type.
+                                        If None, values are stored as read (float64).
+                                        Default is None.
            
 
         Examples
@@ -65,6 +196,7 @@ class MartheField():
         self.mm = mm
         self.dmv = dmv
         self.use_imask = use_imask
+        self.value_dtype = value_dtype
         self.set_data(data)
         self.maxlayer = len(self.to_grids(inest=0))
         self.maxnest = len(self.to_grids(layer=0)) - 1 # inest = 0 is the main grid
@@ -334,6 +466,49 @@ class MartheField():
             assert len(data.shape) == 3, err_msg
             self.data = self.get_masked(self._3d2rec(data))
 
+        # ---- Store values with required numeric type
+        self.data = self.cast_values(self.data)
+
+
+
+    def cast_values(self, rec):
+        """
+        Return field data (`rec.array`) with values stored in the required
+        numeric type (`.value_dtype`).
+        Note : if the values do not fit in the required dtype range (or if
+               `.value_dtype` is None), the input data is returned.
+
+        Parameters:
+        ----------
+        rec (rec.array) : field data.
+
+        Returns:
+        --------
+        crec (rec.array) : field data with casted values.
+
+        Examples:
+        --------
+        mf.value_dtype = np.float32
+        rec = mf.cast_values(mf.data)
+        """
+        # -- Keep data as provided
+        if self.value_dtype is None:
+            return rec
+
+        # -- Avoid useless copy
+        dt = np.dtype(self.value_dtype)
+        if rec['value'].dtype == dt:
+            return rec
+
+        # -- Keep original dtype for values out of range (high-dynamic-range fields)
+        if rec['value'].size > 0 and np.issubdtype(dt, np.floating):
+            if np.nanmax(np.abs(rec['value'])) > np.finfo(dt).max:
+                return rec
+
+        # -- Cast `value` column only
+        dtypes = [(n, dt if n == 'value' else rec.dtype[n]) for n in rec.dtype.names]
+        return rec.astype(dtypes).view(np.recarray)
+
 
 
     def get_masked(self, rec):
@@ -630,8 +805,11 @@ class MartheField():
         else:
             f = filename
 
-        # ---- Extract refine levels dictionary
-        rl = self.mm.extract_refine_levels()
+        # ---- Fetch refine levels dictionary (computed once by parent model)
+        rl = getattr(self.mm, 'rlevels', None)
+        if rl is None or len(rl) != self.mm.nnest + 1:
+            rl = self.mm.extract_refine_levels()
+            self.mm.rlevels = rl
 
         # ---- Write field data from list of MartheGrid instance
         with open(f, 'w', encoding = marthe_utils.encoding) as f:
@@ -926,9 +1104,9 @@ class MartheField():
         # ---- Get field vertices
         vx, vy = self.get_xyvertices()
 
-        # ---- Iterate over all polygons
+        # ---- Iterate over all polygons to gather zonal data
         dfs = []
-        for p, name in zip(polygons, _names):
+        for zid, (p, name) in enumerate(zip(polygons, _names)):
             # -- Mask vertices in polygon
             mask = shp_utils.point_in_polygon(vx, vy, p)
             # ---- Map layer to vertices coord
@@ -938,14 +1116,35 @@ class MartheField():
                                 autoconvert=True, usemask=False)
             # -- Get data as DataFrame
             df = pd.DataFrame.from_records(rec).drop_duplicates()
-            df['zone'] = name
-            # -- Perform required stats on tranform value
-            if trans is not None:
-                df['value'] = df['value'].transform(trans)
-            stats = df.groupby(['zone', 'layer'])['value'].agg(_stats)
-            dfs.append(stats)
-        # ---- Build zonal stats DataFrame
-        zstats_df = pd.concat(dfs)
+            df['zid'] = zid
+            dfs.append(df)
+        df = pd.concat(dfs, ignore_index=True)
+
+        # ---- Transform values once for all zones
+        if trans is not None:
+            df['value'] = pest_utils.transform(df['value'], trans).to_numpy()
+
+        # ---- Perform required stats on all (zone, layer) groups at once
+        if all(isinstance(s, str) and s in group_stats for s in _stats):
+            # -- Build a single integer key per (zone, layer) group
+            zids, layers = df['zid'].to_numpy(), df['layer'].to_numpy()
+            nl = layers.max() + 1 if len(layers) > 0 else 1
+            keys, gid = np.unique(zids * nl + layers, return_inverse=True)
+            res = get_group_stats(df['value'].to_numpy(dtype=float),
+                                  gid, len(keys), _stats)
+            midx = pd.MultiIndex.from_arrays(
+                        [np.array(_names, dtype=object)[keys // nl], keys % nl],
+                        names=['zone', 'layer'])
+            zstats_df = pd.DataFrame(res, index=midx, columns=_stats)
+        else:
+            # -- Group on integer keys only, zone names are attached afterwards
+            df['layer'] = df['layer'].astype(np.int32)
+            zstats_df = df.groupby(['zid', 'layer'], sort=True)['value'].agg(_stats)
+            zids, layers = map(zstats_df.index.get_level_values, ['zid', 'layer'])
+            zstats_df.index = pd.MultiIndex.from_arrays(
+                        [np.array(_names, dtype=object)[zids], layers.astype(int)],
+                        names=['zone', 'layer'])
+
         # ---- Return
         return zstats_df
 
@@ -1019,8 +1218,8 @@ class MartheField():
         # -- Get Vtk instance
         vtk = self.mm.get_vtk(**kwargs)
 
-        # -- Add field data to vtk
-        vtk.add_array(self.data['value'],
+        # -- Add field data to vtk (as a single contiguous float64 buffer)
+        vtk.add_array(np.ascontiguousarray(self.data['value'], dtype=np.float64),
                       name=self.field,
                       trans=trans,
                       masked_values=mv)
@@ -1045,6 +1244,128 @@ class MartheField():
 
 
 
+class _MartheFieldView(MartheField):
+    """
+    Lightweight read-only MartheField sharing the parent model `.imask` geometry.
+    Used by MartheFieldSeries to avoid copying the whole `.imask`
+    field for each timestep: the field data (`rec.array`) is only
+    built on first access from the provided values (copy-on-access).
+    Note: the provided values (row of `MartheFieldSeries.values`) are
+          the only source of field values, the field data of a view
+          can not be modified. Copies of a view (copy(), deepcopy())
+          are standard editable MartheField instances.
+    """
+    def __init__(self, field, values, mm):
+        """
+        Parameters
+        -----------
+        field (str) : field name.
+        values (1D-array) : field values (same size as `mm.imask.data`).
+        mm (MartheModel) : parent Marthe model.
+
+        Examples
+        -----------
+        mf = _MartheFieldView('CHARGE_01', values[1], mm)
+        """
+        self.field = field
+        self.mm = mm
+        self.dmv = dmv
+        self.use_imask = True
+        self.value_dtype = mm.imask.value_dtype
+        self.maxlayer = mm.imask.maxlayer
+        self.maxnest = mm.imask.maxnest
+        self._proptype = 'grid'
+        self._values = values
+        self._data = None
+
+
+    @classmethod
+    def factory(cls, mm):
+        """
+        Build a specialized constructor of field views for a given model.
+        The attributes shared by all views (model, `.imask` metadata, ...)
+        are resolved once, each call then only sets the field name and values.
+
+        Parameters
+        -----------
+        mm (MartheModel) : parent Marthe model.
+
+        Returns
+        -----------
+        make (func) : constructor with signature make(field, values).
+
+        Examples
+        -----------
+        make = _MartheFieldView.factory(mm)
+        mf = make('CHARGE_01', values[1])
+        """
+        template = cls('', None, mm).__dict__
+        def make(field, values):
+            mf = object.__new__(cls)
+            mf.__dict__.update(template)
+            mf.field, mf._values = field, values
+            return mf
+        return make
+
+
+
+    @property
+    def data(self):
+        """
+        Field data (`rec.array`), built from `.imask` on first access.
+        """
+        if self._data is None:
+            self._data = self.mm.imask.data.copy()
+            self._data['value'] = self._values
+            self._data.flags.writeable = False
+        return self._data
+
+
+    @data.setter
+    def data(self, rec):
+        err_msg = f"ERROR : data of field `{self.field}` is read-only " \
+                   "(simulated field series values are stored in " \
+                   "`MartheFieldSeries.values`)."
+        raise AttributeError(err_msg)
+
+
+
+    def _as_field(self, cp):
+        """
+        Standard (editable) MartheField with a writable copy of the field data.
+        `cp` is the copy function applied to the other attributes.
+        """
+        mf = object.__new__(MartheField)
+        for k, v in self.__dict__.items():
+            if k not in ('_values', '_data'):
+                mf.__dict__[k] = cp(v)
+        mf.data = self.data.copy()
+        return mf
+
+
+    def __copy__(self):
+        return self._as_field(lambda v: v)
+
+
+    def __deepcopy__(self, memo):
+        return self._as_field(lambda v: deepcopy(v, memo))
+
+
+    def _detached(self):
+        """
+        Copy of the view without field data, values and parent model
+        (light and picklable, used to render animation frames).
+        """
+        mf = object.__new__(type(self))
+        mf.__dict__.update(self.__dict__)
+        mf._data, mf._values, mf.mm = None, None, None
+        return mf
+
+
+
+
+
+
 
 class MartheFieldSeries():
     """
@@ -1080,6 +1401,14 @@ class MartheFieldSeries():
         self.fields = self.indexer.field.unique()
         # -- Prepare dictionary of sim data
         self.data = dict.fromkeys(self.fields)
+        # -- Prepare dictionary of stacked sim values (istep, node)
+        self.values = dict.fromkeys(self.fields)
+        # -- Prepare dictionary of loaded isteps (rows of `.values`)
+        self.isteps = dict.fromkeys(self.fields)
+        # -- Prepare cache of default time series names by (nodes, base)
+        self._tsnames = {}
+        # -- Prepare cache of pyshp parts (geometries) by (layer, inest)
+        self._parts = {}
 
 
 
@@ -1131,6 +1460,11 @@ class MartheFieldSeries():
         Format: { istep_0: MartheField_0,
                   ...,
                   istep_N: Marthefield_N}
+        Simulated values of all isteps are stacked in `.values[field]`
+        (rows ordered as `.isteps[field]`), which is the only source of
+        field values: `.values[field]` and the MartheField instances of
+        `.data[field]` are read-only views on it (copies of these
+        MartheField instances are standard editable MartheField).
 
         Parameters
         -----------
@@ -1167,36 +1501,47 @@ class MartheFieldSeries():
         digits = len(str(np.max(isteps)))
 
         # -- Subset indexer by required field and isetps
-        df = self.indexer.query(f"field == '{field}' & istep in @isteps")
+        df = self.indexer[(self.indexer['field'] == field) & self.indexer['istep'].isin(isteps)]
 
-        # -- Get all required MartheGrid instances
+        # -- Stream required MartheGrid instances and fill simulated values
+        #    of all isteps in a single preallocated 2D-array (istep, node)
         print(f'Extract `{field}` MartheGrid instances ...')
-        df['mg'] = marthe_utils.read_grid_file(self.chasim, start=df.start, end=df.end)
+        steps, kstep = np.unique(df['istep'].to_numpy(), return_inverse=True)
+        nnode = self.mm.imask.data.size
+        values = np.full((len(steps), nnode), np.nan)
+        offset = np.zeros(len(steps), dtype=int)
+        for k, mg in zip(kstep, marthe_utils.iter_grid_file(self.chasim,
+                                                            start=df.start,
+                                                            end=df.end)):
+            n = mg.array.size
+            values[k, offset[k]:offset[k] + n] = mg.array.ravel()
+            offset[k] += n
+
+        # -- Check that grids of each istep cover all model cells
+        #    (ex: truncated `chasim.out` file after a crashed run)
+        bad = steps[offset != nnode]
+        err_msg = f"ERROR : simulated `{field}` grids do not match model cells " \
+                  f"({nnode}) for istep(s): {', '.join(map(str, bad))}. " \
+                  f"Check `{self.chasim}` integrity."
+        assert len(bad) == 0, err_msg
 
         # -- Iterate over isteps to (re)construct MartheField instances
         print(f'Convert `{field}` to MartheField instances ...')
         mf_dic = {}
-        progress = 1
-        for i, idf in df.groupby('istep'):
+        make = _MartheFieldView.factory(self.mm)
+        for k, i in enumerate(steps):
             # Inform user about the time processing
-            marthe_utils.progress_bar(progress/len(isteps))
-            # Get index of start/end section in chasim file
-            start, end = idf['start'].min(), idf['end'].max()
-            # Perform a deepcopy of the .imask field
-            mf = deepcopy(self.mm.imask)
-            # Replace .imask value by field simulated values
-            # (using hstack instead of concatenate to speed up process)
-            mf.data['value'] = np.hstack(
-                                    idf.mg.apply(
-                                        lambda g: g.array.ravel()
-                                        ).to_numpy()
-                                    )
-            # Add field name according to current timestep
-            mf.field = '{}_{}'.format(field, str(i).zfill(digits))
+            marthe_utils.progress_bar((k+1)/len(isteps))
+            # Build a lightweight field sharing .imask geometry
+            # (data will only be built from simulated values when required)
+            mf = make('{}_{}'.format(field, str(i).zfill(digits)), values[k])
             # Add MartheField instance to main field dictionary
             mf_dic[i] = mf
-            # Update progress
-            progress += 1
+
+        # -- Store stacked values (read-only, rows ordered as `.isteps[field]`)
+        values.flags.writeable = False
+        self.values[field] = values
+        self.isteps[field] = steps
 
         # -- Add Marthefield records in main data dictionary
         self.data[field] = mf_dic
@@ -1270,26 +1615,29 @@ class MartheFieldSeries():
         # -- Get node numbers of x,y,layer coordinates
         nodes = self.mm.get_node(_x, _y, _layer)
 
-        # -- Get field data on nodes as DataFrame
-        df = pd.DataFrame.from_records(
-              [self.data[field][istep].data[nodes]['value']
-                    for istep in self.data[field].keys()]
-                    )
-        
-        # -- Add column names
+        # -- Get field data on nodes for all isteps at once (single gather)
+        arr = self.values[field][:, nodes].astype(float)
+
+        # -- Convert masked values to NaN (single mask on the whole array)
+        if masked_values is not None:
+            arr[np.isin(arr, marthe_utils.make_iterable(masked_values))] = np.nan
+
+        # -- Get column names
         if names is None:
-            ijk = self.mm.query_grid(node=nodes, target=['i','j','layer']).to_numpy() + base
-            df.columns = [f'{ix}i_{iy}j_{ik}k' for ix,iy,ik in ijk]
+            key = (tuple(nodes), base)
+            if key not in self._tsnames:
+                ijk = self.mm.query_grid(node=nodes, target=['i','j','layer']).to_numpy() + base
+                self._tsnames[key] = list(map('{}i_{}j_{}k'.format, *ijk.T))
+            columns = self._tsnames[key]
         else:
-            df.columns = marthe_utils.make_iterable(names)
+            columns = marthe_utils.make_iterable(names)
 
-        # -- Convert basic index to MultiIndex
-        df = df.set_index( pd.MultiIndex.from_tuples(
-                                [(istep, self.mm.mldates[istep]) for istep in self.data[field].keys()],
-                                names = ['istep', 'date'])
-                          ).replace(
-                        marthe_utils.make_iterable(masked_values),
-                        np.nan       )
+        # -- Build DataFrame with MultiIndex (built from arrays)
+        isteps = self.isteps[field]
+        df = pd.DataFrame(arr, columns=columns,
+                          index=pd.MultiIndex.from_arrays(
+                                [isteps, self.mm.mldates[isteps]],
+                                names = ['istep', 'date']))
 
         # -- Return Multiindex DataFrame
         if index == 'date':
@@ -1304,7 +1652,7 @@ class MartheFieldSeries():
 
 
 
-    def save_animation(self, field, filename, dpf = 0.25, dpi=200, **kwargs):
+    def save_animation(self, field, filename, dpf = 0.25, dpi=200, nproc=1, **kwargs):
         """
         Build a .gif animation from a series of field data.
         /!/ Package `imageio` required /!/
@@ -1322,6 +1670,10 @@ class MartheFieldSeries():
         dpi (int, optional) : dots per inch (=image/plot resolution).
                               Default is 200. 
 
+        nproc (int, optional) : number of processes used to render frames.
+                                If None, all available cpus are used.
+                                Default is 1 (sequential rendering).
+
         **kwargs : MartheField.plot arguments.
 
         Returns:
@@ -1330,7 +1682,7 @@ class MartheFieldSeries():
 
         Examples:
         --------
-        mfs.save_animation('CHARGE', 'chargeout.gif', dpf = 0.2, dpi=200, layer=5, cmap='jet')
+        mfs.save_animation('CHARGE', 'chargeout.gif', dpf = 0.2, dpi=200, nproc=4, layer=5, cmap='jet')
 
         """
         # ---- Try to import imageio package
@@ -1347,36 +1699,54 @@ class MartheFieldSeries():
         tdir = '_temp_'
         if os.path.exists(tdir): shutil.rmtree(tdir)
         os.mkdir(tdir)
-        # -- Get min/max value to fix colorbar (vectorize form for better efficiency)
+        # -- Get min/max value to fix colorbar (single pass on stacked values)
+        #    (stacked values are also the source of each frame data)
         mv = kwargs.get('masked_values', dmv[::2])
-        values = np.array([ mf.data['value'][ ~np.isin(mf.data['value'], mv) ]
-                                                    for mf in self.data[field].values()] )
+        svalues = self.values[field]
+        values = svalues.ravel()
+        values = values[~np.isin(values, marthe_utils.make_iterable(mv))]
         kwargs['vmin'] = kwargs.get('vmin', values.min())
         kwargs['vmax'] = kwargs.get('vmax', values.max())
-        # -- Save animation
-        print(f'Building animation of simulated `{field}`:')
-        with imageio.get_writer(filename, mode='I', duration = dpf) as writer:
-            # -- iterate over tiem step
-            for i, istep in enumerate(self.data[field].keys()):
-                # -- Plot MartheField
-                ax = self.data[field][istep].plot(**kwargs)
-                # -- Add time reference (top left)
-                ilay = kwargs.get('layer', 0)
+        # -- Generate frame arguments lazily (fields are detached from parent model
+        #    to be picklable, frame data is only built when rendering the frame)
+        ilay = kwargs.get('layer', 0)
+        nframe = len(self.isteps[field])
+        digits = len(str(nframe))
+        def frames():
+            for k, istep in enumerate(self.isteps[field]):
+                fmf = self.data[field][istep]._detached()
                 text =  f'layer : {ilay}\n'     \
                         f'istep : {istep}\n'    \
                         f'date : {self.mm.mldates[istep]}'
-                plt.text(0.01, 0.94, text,
-                         fontsize = 7.5, transform=ax.transAxes)
-                # -- Save plot as image
-                digits = len(str(len(self.data[field])))
                 png = os.path.join(tdir, '{}.png'.format(str(istep).zfill(digits)))
-                ax.get_figure().savefig(png, dpi=dpi)
+                yield (fmf, svalues[k], text, png, dpi, kwargs)
+        # -- Save animation
+        print(f'Building animation of simulated `{field}`:')
+        base = self.mm.imask.data
+        with imageio.get_writer(filename, mode='I', duration = dpf) as writer:
+            # -- Render frames sequentially
+            if nproc == 1:
+                _set_frame_base(base)
+                pngs = map(_save_frame, frames())
+                pool = None
+            # -- Render frames in parallel (ordered results, field data sent once per worker)
+            else:
+                import multiprocessing as mp
+                pool = mp.Pool(processes=nproc, initializer=_set_frame_base, initargs=(base, 'Agg'))
+                pngs = pool.imap(_save_frame, frames())
+            # -- Iterate over rendered frames
+            for i, png in enumerate(pngs):
                 # -- Read image
                 image = imageio.imread(png)
                 writer.append_data(image)
                 # -- Plot progress bar
-                marthe_utils.progress_bar((i+1)/len(self.data[field]))
-        # ---- Delete temporal folder
+                marthe_utils.progress_bar((i+1)/nframe)
+            # -- Release workers
+            if pool is not None:
+                pool.close()
+                pool.join()
+        # ---- Release shared frame data and delete temporal folder
+        _set_frame_base(None)
         shutil.rmtree(tdir)
         # -- Close all plots
         plt.close('all')
@@ -1427,54 +1797,53 @@ class MartheFieldSeries():
 
         # -- Build filename if not provided
         if filename is None:
-            filename = f'{self.field}_{layer}.shp'
+            filename = f'{field}_{layer}.shp'
 
-        # -- Get first istep field
-        mf0 = list(self.data[field].values())[0]
+        # -- Get fields ordered as `.values[field]` rows
+        mfs = [self.data[field][i] for i in self.isteps[field]]
+        mf0 = mfs[0]
 
         # ---- Perform a bunch of assertions on `layer` and `inest` arguments
         err_msg = f"`layer` must be an integer between 0 and {mf0.maxlayer -1}."
         assert isinstance(layer, int), err_msg
         assert 0 <= layer < mf0.maxlayer, err_msg
 
-        # ---- Fetch pyshp parts (polygons) for istep field
-        parts = []
-        for mg in mf0.to_grids(layer=layer, inest=inest):
-            parts.extend(mg.to_pyshp())
+        # ---- Fetch pyshp parts (polygons) once for all isteps (and calls)
+        if (layer, inest) not in self._parts:
+            self._parts[(layer, inest)] = [ part for mg in mf0.to_grids(layer=layer, inest=inest)
+                                                 for part in mg.to_pyshp() ]
+        parts = self._parts[(layer, inest)]
 
         # ---- Prepare masked_value deletion
-        mv = [] if masked_values is None else masked_values
-
-        # ---- Fetch data for all isteps
-        dfs = []
-        for istep, mf in self.data[field].items():
-            data = mf.get_data(layer=layer, inest=inest)
-            df = pd.DataFrame.from_records(data).assign(parts=parts)
-            # -- Manage masked vales
-            df  = df[~df['value'].isin(mv)]
-            # -- Change column name according to istep
-            # am 2023-11-inplace not authorized anymore in pandas
-            # df.rename(columns={'value': mf.field}, inplace=True)
-            df = df.rename(columns={'value': mf.field})
-            dfs.append(df)
+        mv = [] if masked_values is None else marthe_utils.make_iterable(masked_values)
 
-        # -- Concatenate drop duplicated layer,inest,i,j,x,y columns
-        _df = pd.concat(dfs, axis=1)
-        df = _df.loc[:,~_df.columns.duplicated()]
+        # ---- Fetch layer,inest,i,j,x,y columns once (shared by all isteps)
+        lmask = self.mm.imask.get_data(layer=layer, inest=inest, as_mask=True)
+        base = self.mm.imask.data[lmask]
 
-        # ---- Fetch subset parts (goemetries)
-        parts = df.pop('parts')
+        # ---- Fetch data for all isteps as a single (cell, istep) numeric matrix
+        values = self.values[field][:, lmask].T.astype(float)
+        # -- Manage masked values (drop cells masked for all isteps)
+        values[np.isin(values, mv)] = np.nan
+        keep = ~np.isnan(values).all(axis=1)
+        # -- Set column names according to istep (same order as value rows)
+        cols = [mf.field for mf in mfs]
 
-        # ---- Log transform if required
+        # ---- Log transform if required (single ufunc pass on the value block)
         if log:
-            mask = df.columns.str.startswith(self.field)
-            df.loc[:,mask] = df.loc[:,mask].apply(
-                                lambda col: col.transform('log10'))
-            df =  df.loc[:,mask].add_prefix('log_')
+            np.log10(values, out=values)
+            cols = ['log_' + c for c in cols]
+
+        # ---- Build output recarray directly from kept cells (no DataFrame concat)
+        bcols = [c for c in base.dtype.names if c != 'value']
+        rec = np.rec.fromarrays([base[c][keep] for c in bcols] + list(values[keep].T),
+                                names=bcols + cols)
+
+        # ---- Fetch subset parts (goemetries)
+        parts = [parts[i] for i in np.flatnonzero(keep)]
 
         # ---- Convert reccaray to shafile
-        shp_utils.recarray2shp(df.to_records(index=False), np.array(parts),
-                               shpname=filename, epsg=epsg, prj=prj)
+        shp_utils.recarray2shp(rec, parts, shpname=filename, epsg=epsg, prj=prj)
 
 
 
@@ -6,23 +6,114 @@ One instance per obs location.
 
 
 import os, sys
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 pd.options.mode.chained_assignment = None  # Ignore pandas SettingWithCopyWarning
 from pymarthe import *
 from .utils import marthe_utils, pest_utils
 
-
 base_obs = ['obsnme', 'date', 'obsval',
             'datatype', 'locnme', 'obsfile',
             'weight', 'obgnme', 'trans' ]
 
 
 
+@lru_cache(maxsize=4096)
+def _loc_prefix(iloc):
+    """
+    Default observation name prefix of a location (ex: 'loc007n').
+    """
+    return 'loc{}n'.format(str(iloc).zfill(3))
+
+
+
+@lru_cache(maxsize=4096)
+def _ndigit(n):
+    """
+    Number of digits required to write n observation ids.
+    """
+    return len(str(n - 1))
+
+
+
+def _obs_names(prefix, n, ndigit, nmin=5000):
+    """
+    Build n default observation names ('<prefix><zero padded id>').
+    Short series (n < `nmin`) use a plain f-string comprehension.
+    Otherwise, names are written as unicode code points in a fixed width
+    (n, len(prefix) + ndigit) buffer viewed as a string array,
+    so that no intermediate python string is created per id.
+    """
+    if n < nmin:
+        return [f'{prefix}{i:0{ndigit}d}' for i in range(n)]
+    width = len(prefix) + ndigit
+    buf = np.empty((n, width), dtype=np.uint32)
+    buf[:, :len(prefix)] = np.array(list(map(ord, prefix)), dtype=np.uint32)
+    pows = 10 ** np.arange(ndigit - 1, -1, -1, dtype=np.int64)
+    buf[:, len(prefix):] = np.arange(n, dtype=np.int64)[:, None] // pows % 10 + ord('0')
+    return buf.view(f'U{width}').ravel().tolist()
+
+
+
+@lru_cache(maxsize=8)
+def _read_prn(prn, stamp):
+    """
+    Cached marthe_utils.read_prn() by file path and file stamp
+    (modification time, size, inode): the prn file is read again once
+    it has been rewritten, even within the file system time resolution.
+    """
+    return marthe_utils.read_prn(prn)
+
+
+
+@lru_cache(maxsize=1)
+def _string_dtype():
+    """
+    Contiguous arrow strings dtype for non categorical string columns
+    (only if `pyarrow` is installed, resolved on first use).
+    """
+    from importlib.util import find_spec
+    return 'string[pyarrow]' if find_spec('pyarrow') is not None else None
+
+
+
+def _constant_column(value, n, categorical=True):
+    """
+    Broadcast a constant value to a column of size n.
+    If `categorical` is True, the column is stored as a single
+    category pd.Categorical (one value + int8 codes) instead of
+    a full-length object array (missing values, ex: obsfile=None,
+    give an all-missing pd.Categorical without category).
+    Otherwise, string values are stored as pyarrow strings
+    (if `pyarrow` is installed).
+    """
+    if categorical:
+        if pd.isna(value):
+            return pd.Categorical.from_codes(np.full(n, -1, dtype=np.int8),
+                                             categories=pd.Index([], dtype=object))
+        return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8),
+                                         categories=[value])
+    column = np.full(n, value, dtype=object)
+    if isinstance(value, str) and _string_dtype() is not None:
+        return pd.array(column, dtype=_string_dtype())
+    return column
+
+
+
 class MartheObs():
     """
     Class to manage Marthe or external observations for PEST coupling purpose
     """
+    # ---- Store constant obs_df columns as pd.Categorical
+    USE_CATEGORICAL = True
+
+    # ---- Fixed attributes (no per-instance __dict__)
+    __slots__ = ('nodata', 'datatype', 'iloc', 'locnme', 'date', 'value',
+                 'obsfile', 'weight', 'obgnme', 'trans', 'insfile', 'simfile',
+                 'obsnmes', 'fluc_dic', 'interp_method', '_obs_df',
+                 '_sim_dir')
+
     def __init__(self, iloc, locnme, date, value, obsfile = None,
                  datatype= 'head', nodata = None, **kwargs):
         """
@@ -38,6 +129,7 @@ class MartheObs():
         date (pd.DatatimeIndex) : dates index of observation values.
 
         value (iterable) : observation values.
+                           Note: stored as a contiguous float64 np.array.
 
         obsfile (str, optional): observation filename where values and dates are stored.
                                  Default is None.
@@ -98,21 +190,24 @@ class MartheObs():
         # locnme, date and value should be updated when  obs_df is modified
         self.locnme = locnme
         self.date = date
-        self.value = value
+        # (coerced once to a contiguous float64 array)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
         self.obsfile = obsfile
         self.weight = kwargs.get('weight', 1)
         self.obgnme = kwargs.get('obgnme', locnme)
 
         # ---- Check transformation validity
         self.trans = kwargs.get('trans', 'none')
-        pest_utils.check_trans(self.trans)
+        if not (isinstance(self.trans, str) and self.trans == 'none'):
+            pest_utils.check_trans(self.trans)
 
         # ---- Manage io files
         self.insfile = kwargs.get('insfile', f'{self.locnme}.ins')
         self.simfile = kwargs.get('simfile', f'{self.locnme}.dat')
+        self._sim_dir = os.path.dirname(self.simfile) or '.'
 
         # ---- Get number of observation values
-        ndigit = len(str(len(self.value)-1))
+        ndigit = _ndigit(len(self.value))
 
         # ---- Build default observation names
         # Note: maximum number of locnmes is set to 1000 (more than enough)
@@ -120,25 +215,99 @@ class MartheObs():
             # lower case for pyemu compatibility
             self.obsnmes = list(map(lambda x: x.lower(),kwargs['obsnmes']))
         else:
-            self.obsnmes = ['loc{}n{}'.format(str(self.iloc).zfill(3),
-                                              str(i).zfill(ndigit))
-                            for i in range(len(self.value))]
+            self.obsnmes = _obs_names(_loc_prefix(self.iloc),
+                                      len(self.value), ndigit)
 
+        # ---- Store fluctuation arguments
+        self.fluc_dic = kwargs.get('fluc_dic', dict())
+        # ---- Store simulated data interpolation
+        self.interp_method = kwargs.get('interp_method', 'index')
+        # ---- Observations DataFrame is only built on first access
+        self._obs_df = None
+
+
+
+    @property
+    def obs_df(self):
+        """
+        Observations DataFrame, built from input data on first access.
+        """
+        if self._obs_df is None:
+            self._obs_df = self._build_obs_df()
+        return self._obs_df
+
+
+    @obs_df.setter
+    def obs_df(self, df):
+        self._obs_df = df
+
+
+
+    def _build_obs_df(self):
+        """
+        Build observations DataFrame from input data.
+        """
         #NOTE : it would be advantageous to make obs_df a class property
         # doing so, self.date, self. value and others could be modified by the property setter
         # this happends whens self.obs_df is edited by the user
         # ---- Fill observations DataFrame with input data
-        self.obs_df = pd.DataFrame(index=self.obsnmes)
-        # TODO should be fixed to keep datetime format for date column
-        self.obs_df[base_obs] = np.array( [ self.obsnmes, self.date, self.value,
-                                            self.datatype, self.locnme, self.obsfile,
-                                            self.weight, self.obgnme, self.trans ],
-                                          dtype=object)
+        # (built once from pre-broadcasted columns, keeping date/value dtypes)
+        n, cat = len(self.obsnmes), self.USE_CATEGORICAL
+        # -- Convert observation names once, shared by index and `obsnme` column
+        obsnmes = np.asarray(self.obsnmes, dtype=object)
+        return pd.DataFrame(
+                    { 'obsnme': obsnmes,
+                      'date': np.asarray(self.date),
+                      'obsval': self.value,
+                      'datatype': _constant_column(self.datatype, n, cat),
+                      'locnme': _constant_column(self.locnme, n, cat),
+                      'obsfile': _constant_column(self.obsfile, n, cat),
+                      'weight': np.full(n, self.weight, dtype=np.float64),
+                      'obgnme': _constant_column(self.obgnme, n, cat),
+                      'trans': _constant_column(self.trans, n, cat) },
+                    index=pd.Index(obsnmes, copy=False),
+                    columns=base_obs, copy=False)
+
+
+
+    def _get_obsnmes_dates(self):
+        """
+        Observation names and dates, taken from `.obs_df` only 
+        if it was already built (and possibly edited by the user).
+        """
+        if self._obs_df is not None:
+            return self.obs_df.index, self.obs_df.date
+        return self.obsnmes, pd.Series(self.date)
 
-        # ---- Store fluctuation arguments
-        self.fluc_dic = kwargs.get('fluc_dic', dict())
-        # ---- Store simulated data interpolation
-        self.interp_method = kwargs.get('interp_method', 'index')
+
+
+    def get_nobs(self):
+        """
+        Number of observations (from `.obs_df` only if already built).
+        """
+        return len(self._get_obsnmes_dates()[0])
+
+
+
+    def set_weight(self, weight):
+        """
+        Set observation weight(s), also in `.obs_df` if already built.
+        """
+        self.weight = weight
+        if self._obs_df is not None:
+            self._obs_df['weight'] = weight
+
+
+
+    def set_trans(self, trans):
+        """
+        Set observation transformation, also in `.obs_df` if already built
+        (as a constant column, like when `.obs_df` is built).
+        """
+        self.trans = trans
+        if self._obs_df is not None:
+            self._obs_df['trans'] = _constant_column(trans, len(self._obs_df),
+                                                     self.USE_CATEGORICAL)
 
 
 
@@ -153,18 +322,19 @@ class MartheObs():
 
         Returns:
         --------
-        obs_df (DataFrame) : standard observation DataFrame.
+        obs_df (DataFrame) : standard observation DataFrame
+                             (independent copy of `.obs_df`).
 
         Examples:
         --------
         mobs.get_obs_df(transformed=True)
         
         """
-        # ---- Make a copy of observations ddata
+        # ---- Make a copy of observations data
         obs_df = self.obs_df.copy(deep=True)
         # ---- Transform values if required
-        if transformed:
-            obs_df['obsval'] = pest_utils.transform(obs_df['obsval'], self.trans)
+        if transformed and not (isinstance(self.trans, str) and self.trans == 'none'):
+            obs_df['obsval'] = pest_utils.transform(obs_df['obsval'], self.trans).to_numpy()
         # ---- Return observation DataFrame
         return obs_df
 
@@ -187,9 +357,8 @@ class MartheObs():
         --------
         mobs.write_insfile()
         """
-        #pest_utils.write_insfile(self.obsnmes, self.insfile)
-        # unnecessary if self.obsnmes was updated when obs_df is edited
-        pest_utils.write_insfile(self.obs_df.index, self.insfile)
+        obsnmes, _ = self._get_obsnmes_dates()
+        pest_utils.write_insfile(obsnmes, self.insfile)
     
 
     def write_simfile(self, prn='historiq.prn'):
@@ -214,7 +383,8 @@ class MartheObs():
         """
         # ---- Manage prn
         if isinstance(prn, str):
-            prn_df = marthe_utils.read_prn(prn)
+            st = os.stat(prn)
+            prn_df = _read_prn(os.path.abspath(prn), (st.st_mtime_ns, st.st_size, st.st_ino))
         elif isinstance(prn, pd.DataFrame):
             prn_df = prn
         else:
@@ -223,11 +393,9 @@ class MartheObs():
         # ---- Extract and write simulated value(s)
         pest_utils.extract_prn( prn_df,
                                 name= self.locnme,
-                                #dates_out= self.date,
-                                # unnecessary if self.date was updated when obs_df is edited
-                                dates_out= self.obs_df.date,
+                                dates_out= self._get_obsnmes_dates()[1],
                                 fluc_dic= self.fluc_dic,
-                                sim_dir= os.path.split(self.simfile)[0] )
+                                sim_dir= self._sim_dir )
 
 
 
@@ -236,6 +404,13 @@ class MartheObs():
         """
         Convert MartheObs main informations to string.
         """
+        # ---- Serialize observation dates (vectorized for datetime64 dates)
+        dates = np.asarray(self._get_obsnmes_dates()[1])
+        if np.issubdtype(dates.dtype, np.datetime64):
+            dates_str = np.datetime_as_string(dates, unit='s').tolist()
+        else:
+            dates_str = list(map(str, dates))
+
         lines = ['[START_OBS]']
         data = [
             'locnme= {}'.format(self.locnme),
@@ -243,7 +418,7 @@ class MartheObs():
             'trans= {}'.format(self.trans),
             'fluc_dic= {}'.format(str(self.fluc_dic)),
             'interp_method= {}'.format(self.interp_method),
-            'dates_out= {}'.format('|'.join([str(v) for v in self.obs_df.date]))
+            'dates_out= {}'.format('|'.join(dates_str))
               ]
         lines.extend(data)
         lines.append('[END_OBS]')
@@ -9,6 +9,8 @@ import numpy as np
 import pandas as pd 
 import pyemu
 import warnings
+from collections import Counter
+from functools import lru_cache
 from datetime import datetime
 
 from pymarthe.marthe import MartheModel
@@ -25,6 +27,14 @@ base_obs = ['obsnme', 'date', 'obsval',
             'datatype', 'locnme', 'obsfile',
             'weight', 'obgnme', 'trans' ]
 
+# ---- Set observation data schema (same dtypes as MartheObs.obs_df,
+#      constant columns stored as categoricals, see MartheObs.USE_CATEGORICAL)
+base_obs_dtypes = { 'obsnme': object, 'date': 'datetime64[ns]',
+                    'obsval': np.float64, 'datatype': 'category',
+                    'locnme': 'category', 'obsfile': 'category',
+                    'weight': np.float64, 'obgnme': 'category',
+                    'trans': 'category' }
+
 base_param = ['parnme', 'trans', 'btrans', 'parchglim',
               'defaultvalue', 'parlbnd', 'parubnd',
               'pargp', 'scale', 'offset', 'dercom']
@@ -34,6 +44,18 @@ base_param = ['parnme', 'trans', 'btrans', 'parchglim',
 encoding = 'latin-1'
 
 
+
+@lru_cache(maxsize=32)
+def _read_histo_index(histo_file, stamp):
+    """
+    Cached locnmes (index) of marthe_utils.read_histo_file() by file path
+    and file stamp (modification time, size, inode): the histo file is
+    only read again once modified.
+    """
+    return marthe_utils.read_histo_file(histo_file).index
+
+
+
 class MartheOptim():
     """
     Wrapper Python --> PEST.
@@ -75,10 +97,19 @@ class MartheOptim():
         self.tw_min, self.tw_max = self.mm.get_time_window()
         # ---- Initialize observation and parameters
         self.obs, self.param = {}, {}
+        # ---- Initialize observation location counter (next `iloc`)
+        self._iloc = 0
+        # ---- Initialize index of locnmes by observation data type
+        self._dt_locs = {}
         # ---- Fetch available observation localisation names
-        self.available_locnmes = marthe_utils.read_histo_file(mm.mlfiles['histo']).index
-        # ---- Set commun no data values
-        self.nodata = NO_DATA_VALUES
+        histo_file = mm.mlfiles['histo']
+        st = os.stat(histo_file)
+        self.available_locnmes = _read_histo_index(os.path.abspath(histo_file),
+                                                   (st.st_mtime_ns, st.st_size, st.st_ino))
+        # ---- Count occurences of each available locnme once (for check_loc())
+        self._locnme_counts = Counter(self.available_locnmes)
+        # ---- Set commun no data values (as array, ready for np.isin())
+        self.nodata = np.array(NO_DATA_VALUES, dtype=np.float64)
         # ---- Set parameter and observation folder
         self.par_dir = kwargs.get('par_dir', '.')
         self.tpl_dir = kwargs.get('tpl_dir', '.')
@@ -106,9 +137,20 @@ class MartheOptim():
         moptim.get_obs_df(transformed=True)
         """
         if len(self.obs) > 0:
-            return pd.concat([mo.get_obs_df(transformed)for mo in self.obs.values()])
+            dfs = [mo.get_obs_df(transformed) for mo in self.obs.values()]
+            obs_df = pd.concat(dfs)
+            # -- Keep constant columns as compact (union) categoricals
+            for col in base_obs:
+                if all(isinstance(df[col].dtype, pd.CategoricalDtype) for df in dfs):
+                    obs_df[col] = pd.api.types.union_categoricals(
+                                        [df[col] for df in dfs])
+            # -- Always encode low cardinality `datatype`, `locnme` and `obgnme` columns
+            for col in ['datatype', 'locnme', 'obgnme']:
+                if not isinstance(obs_df[col].dtype, pd.CategoricalDtype):
+                    obs_df[col] = obs_df[col].astype('category')
+            return obs_df
         else:
-            return pd.DataFrame(columns = base_obs)
+            return pd.DataFrame(columns = base_obs).astype(base_obs_dtypes)
 
 
 
@@ -139,6 +181,24 @@ class MartheOptim():
 
 
 
+    def get_npar(self):
+        """
+        Function to fetch number of parameters
+        stored in MartheOptim instance.
+
+        Returns:
+        --------
+        npar (int) : number of parameters
+
+        Examples:
+        --------
+        print(f"There are {moptim.get_npar()} parameters.")
+        """
+        return sum(mp.get_npar() for mp in self.param.values())
+
+
+
+
     def get_nobs(self, locnme = None, null_weight = True):
         """
         Function to fetch number of observation
@@ -158,15 +218,19 @@ class MartheOptim():
         --------
         print(f"There are {moptim.get_nobs()} observations.")
         """
-        # ---- Subset by locnme if required
-        _ln = list(self.obs.keys()) if locnme is None else marthe_utils.make_iterable(locnme)
+        # ---- Subset by locnme if required (only visit required MartheObs)
+        if locnme is None:
+            mos = self.obs.values()
+        else:
+            mos = [self.obs[ln] for ln in set(marthe_utils.make_iterable(locnme))
+                   if ln in self.obs]
         # ---- Start counting locnames
         nobs = 0
-        # ---- Iterate over all MartheObs instance
-        for mo in self.obs.values():
+        # ---- Iterate over required MartheObs instance
+        for mo in mos:
             nw_cond = True if null_weight else mo.weight != 0
-            if (mo.locnme in _ln) & (nw_cond):
-                nobs += len(mo.obs_df)
+            if nw_cond:
+                nobs += mo.get_nobs()
         # ---- Return
         return nobs
 
@@ -190,13 +254,11 @@ class MartheOptim():
         print(f"There are {moptim.get_nlocs()} observations.")
         """
         # ---- Subset by locnme if required
-        _dt = [mo.datatype for mo in self.obs.values()] if datatype is None else marthe_utils.make_iterable(datatype)
-        # ---- Start counting locnames
-        nlocs = 0
-        # ---- Iterate over all MartheObs instance
-        for mo in self.obs.values():
-            if mo.datatype in _dt:
-                nlocs += 1
+        if datatype is None:
+            return len(self.obs)
+        _dt = set(marthe_utils.make_iterable(datatype))
+        # ---- Count locnames with required datatype (from datatype index)
+        nlocs = sum(len(self._dt_locs.get(dt, ())) for dt in _dt)
         # ---- Return number of locnames with required datatype
         return nlocs
 
@@ -219,8 +281,8 @@ class MartheOptim():
         ndt = moptim.get_ndatatypes()
         print(f"There are {ndt} observation data types")
         """
-        dt = [mo.datatype for mo in self.obs.values()]
-        return len(set(dt))
+        # ---- Count data types with at least one locnme (from datatype index)
+        return sum(1 for lns in self._dt_locs.values() if lns)
 
 
 
@@ -251,11 +313,9 @@ class MartheOptim():
         locnme = 'mylocname'
         exi, uni = moptim.check_loc(locnme)
         """
-        # ---- Get existence if required
-        exi = locnme in self.available_locnmes
-        # ---- Get unicity
-        mask = self.available_locnmes.str.fullmatch(locnme).tolist()
-        uni = mask.count(True) <= 1
+        # ---- Get existence and unicity (exact name, hashed lookup)
+        count = self._locnme_counts.get(locnme, 0)
+        exi, uni = count > 0, count <= 1
         # ---- Error handling
         if error == 'raise':
             hf = self.mm.mlfiles['histo']
@@ -384,7 +444,7 @@ class MartheOptim():
         # ---- Build MartheObs instance from data input
         insfile = kwargs.pop('insfile', os.path.join(self.ins_dir, f'{locnme}.ins'))
         simfile = kwargs.pop('simfile', os.path.join(self.sim_dir, f'{locnme}.dat'))
-        mobs = MartheObs(iloc = self.get_nlocs(),
+        mobs = MartheObs(iloc = self._iloc,
                          locnme = locnme,
                          date = df_tw.index,
                          value = df_tw['value'].values,
@@ -396,6 +456,8 @@ class MartheOptim():
 
         # ---- Add MartheObs to main observation dictionary
         self.obs[locnme] = mobs
+        self._dt_locs.setdefault(datatype, set()).add(locnme)
+        self._iloc += 1
 
 
 
@@ -415,6 +477,11 @@ class MartheOptim():
         --------
         Delete observation(s) by locnme in
         observation dictionary.
+        Note: removing all observations resets the location counter
+              (next added observation gets `iloc` = 0, as in a new
+              MartheOptim instance). A partial removal keeps it unchanged,
+              so that remaining and newly added locations never share
+              the same `iloc` (and default observation names).
 
         Examples:
         --------
@@ -422,11 +489,13 @@ class MartheOptim():
         """
 
         if locnme is None:
-            self.obs = {}
+            self.obs, self._dt_locs = {}, {}
+            self._iloc = 0
             if verbose:
                 print('All provided observations had been removed successfully.')
         else:
             for ln in marthe_utils.make_iterable(locnme):
+                self._dt_locs[self.obs[ln].datatype].discard(ln)
                 del self.obs[ln]
                 if verbose:
                     print(f"Observation `{ln}` had been removed successfully.")
@@ -495,15 +564,17 @@ class MartheOptim():
         # -- Check transformations validity
         pest_utils.check_trans(trans)
 
-        # ---- Get datatype, locnme required as iterable
-        _dt = set([mo.datatype for mo in self.obs.values()]) if datatype is None else marthe_utils.make_iterable(datatype)
-        _ln = self.obs.keys() if locnme is None else marthe_utils.make_iterable(locnme)
+        # ---- Get required locnmes from datatype index (hashed lookups)
+        if datatype is None:
+            lns = set(self.obs.keys())
+        else:
+            lns = set().union(*(self._dt_locs.get(dt, ()) for dt in marthe_utils.make_iterable(datatype)))
+        if locnme is not None:
+            lns &= set(marthe_utils.make_iterable(locnme))
 
         # ---- Set transformation to all required data
-        for mo in self.obs.values():
-            if (mo.datatype in _dt) & (mo.locnme in _ln):
-                self.obs[mo.locnme].trans = trans
-                self.obs[mo.locnme].obs_df['trans'] = trans
+        for ln in lns:
+            self.obs[ln].set_trans(trans)
 
 
 
@@ -540,22 +611,24 @@ class MartheOptim():
         pest_utils.check_trans(trans)
         pest_utils.check_trans(btrans)
 
-        # ---- Get parameter names and groups as iterable
-        _pn = self.param.keys() if parname is None else marthe_utils.make_iterable(parname)
-        _pg = set([mp.pargp for mp in self.param.values()]) if pargp is None else marthe_utils.make_iterable(pargp)
+        # ---- Get parameter names and groups as sets (hashed lookups)
+        _pn = self.param.keys() if parname is None else set(marthe_utils.make_iterable(parname))
+        _pg = None if pargp is None else set(marthe_utils.make_iterable(pargp))
 
         # ---- Set transformation to all required data
         for mp in self.param.values():
-            if (mp.parname in _pn) & (mp.pargp in _pg):
+            if mp.parname in _pn and (_pg is None or mp.pargp in _pg):
                 self.param[mp.parname].trans  = trans
                 self.param[mp.parname].btrans = btrans
                 if mp.type == 'list':
-                    self.param[mp.parname].param_df[['trans', 'btrans']] = [trans, btrans]
+                    # -- Set scalar columns one by one (no list broadcasting)
+                    self.param[mp.parname].param_df['trans'] = trans
+                    self.param[mp.parname].param_df['btrans'] = btrans
 
 
 
 
-    def write_insfile(self, locnme=None, cleanup=True):
+    def write_insfile(self, locnme=None, cleanup=True, nthreads=None):
         """
         Write formatted instruction file in instruction directory (`.ins_dir`).
         Wrapper of pest_utils.write_insfile().
@@ -570,6 +643,11 @@ class MartheOptim():
                                    extension in `.ins_dir`.
                                    Default is True.
 
+        nthreads (int, optional) : number of threads used to write
+                                   instruction files (I/O bound).
+                                   If None, nthreads = min(32, number of locnmes).
+                                   Default is None.
+
         Returns:
         --------
         Write insfile file in ins_dir
@@ -594,9 +672,16 @@ class MartheOptim():
             err_msg = "ERROR : Some provided `locnme` not added yet: {}.".format(', '.join(not_found))
             assert len(not_found) == 0, err_msg
 
-        # ---- Iterate over locnmes
-        for ln in locnmes:
-            self.obs[ln].write_insfile()
+        # ---- Write instruction files of all locnmes (independent files)
+        locnmes = list(locnmes)
+        nthreads = min(32, len(locnmes)) if nthreads is None else nthreads
+        if nthreads <= 1:
+            for ln in locnmes:
+                self.obs[ln].write_insfile()
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=nthreads) as ex:
+                list(ex.map(lambda ln: self.obs[ln].write_insfile(), locnmes))
 
             
 
@@ -691,13 +776,23 @@ class MartheOptim():
             if ln in self.obs.keys():
                 # ---- Define new locnme
                 new_locnme = ln + tag + 'f'
-                # ---- Get DataFrame of the source observation
-                df = self.obs[ln].obs_df.set_index('date').rename({'obsval':'value'}, axis=1)
+                # ---- Get source observation dates and values as arrays
+                src_df = self.obs[ln].obs_df
+                vals = src_df['obsval'].to_numpy(dtype=float)
                 # ---- Infer fluctuation manipulation to perform
-                s = df.loc[df['weight'] != 0, 'value'].replace(self.nodata, pd.NA)  # replace nodata values by NaN and remove obs with 0 weight for fluct calculation
+                # (nodata values set to NaN and obs with 0 weight removed for fluct calculation)
+                nodata_mask = np.isin(vals, self.nodata)
+                s = pd.Series(np.where(nodata_mask, np.nan, vals))[src_df['weight'].to_numpy() != 0]
                 sub_val = s.agg(on) if isinstance(on, str) else on
-                # ---- Get fluctuation by substraction
-                df['value'] = [x - sub_val if not x in self.nodata else x for x in df['value']]
+                # ---- Skip undefined fluctuation (ex: only nodata/null weight values)
+                if pd.isna(sub_val):
+                    warn_msg = f"WARNING : could not compute `{on}` on observation with `locnme` = {ln}. " \
+                               "Fluctuation observation set will not be added."
+                    warnings.warn(warn_msg)
+                    continue
+                # ---- Get fluctuation by substraction (nodata values are kept)
+                df = pd.DataFrame({'value': np.where(nodata_mask, vals, vals - sub_val)},
+                                  index=pd.Index(src_df['date'].to_numpy(), name='date'))
                 # ---- Add fluctuation observation
                 new_dt = self.obs[ln].datatype + tag + 'f'
                 self.add_obs(data = df, locnme = new_locnme,
@@ -738,31 +833,34 @@ class MartheOptim():
         # ----- Verify at least 1 locnme exist
         msg = f'ERROR : no observations provided yet. Use .add_obs() function.'
         assert len(self.obs) > 0, msg
-        # ---- Extract actual observation DataFrame
-        obs_df = self.get_obs_df()
-        # ---- Build default dictionary
-        default_dic = {dt: 1 for dt in obs_df['datatype'].unique()}
-        # ---- Set tuning factor dictionary
+        # ---- Gather number of observations of each locnme in a single table
+        locs = pd.DataFrame( [ (ln, mo.datatype, mo.get_nobs())
+                               for ln, mo in self.obs.items() ],
+                             columns = ['locnme', 'datatype', 'n'] )
+        # ---- Get data types once
+        dtypes = locs['datatype'].unique()
+        # ---- Set tuning factor dictionary (independent default dictionary)
         if lambda_dic is None:
-            lambda_dic = default_dic
+            lambda_dic = dict.fromkeys(dtypes, 1)
         lambda_n = sum(lambda_dic.values())
-        # ---- Set variance dictionary
+        # ---- Set variance dictionary (independent default dictionary)
         if sigma_dic is None:
-            sigma_dic = default_dic
-        # ---- Iterate over data types
-        for datatype in default_dic.keys():
-            # -- Get number of observation sets for a given data type
-            dt_df = obs_df.query(f"datatype == '{datatype}'")
-            m = self.get_nlocs(datatype=datatype)
-            # ---- Iterate over locnmes
-            for locnme in dt_df['locnme'].unique():
-                # -- Get number of observations for a given set of observation
-                n = self.get_nobs(locnme=locnme)
-                # -- Compute weights
-                w = pest_utils.compute_weight(lambda_dic[datatype], lambda_n, m, n, sigma_dic[datatype])
-                # -- Set computed weights
-                self.obs[locnme].weight = w
-                self.obs[locnme].obs_df['weight'] = w
+            sigma_dic = dict.fromkeys(dtypes, 1)
+        # ---- Check that all data types are provided
+        for dic in [lambda_dic, sigma_dic]:
+            missing = [dt for dt in dtypes if dt not in dic]
+            err_msg = f'ERROR : missing data type(s) in dictionary: {missing}.'
+            assert len(missing) == 0, err_msg
+        # ---- Get number of observation sets by data type (m) 
+        m = locs.groupby('datatype', sort=False)['locnme'].transform('size')
+        # ---- Compute weights of all locnmes at once
+        w = pest_utils.compute_weight(locs['datatype'].map(lambda_dic).to_numpy(dtype=float),
+                                      lambda_n, m.to_numpy(dtype=float),
+                                      locs['n'].to_numpy(dtype=float),
+                                      locs['datatype'].map(sigma_dic).to_numpy(dtype=float))
+        # ---- Set computed weights
+        for locnme, wi in zip(locs['locnme'], w):
+            self.obs[locnme].set_weight(wi)
 
 
 
@@ -1011,7 +1109,7 @@ class MartheOptim():
         headers.append('Model name: {}'.format(self.mm.mlname))
         headers.append('Model full path: {}'.format(os.path.join(self.mm.rma_path)))
         headers.append('Model spatial index: {}'.format(self.mm.sifile))
-        headers.append('Number of parameters: {}'.format(len(self.get_param_df())))
+        headers.append('Number of parameters: {}'.format(self.get_npar()))
         headers.append('Number of parameters blocks: {}'.format(len(self.param)))
         headers.append('Number of observation data types: {}'.format(self.get_ndatatypes()))
         headers.append('Number of observation blocks: {}'.format(self.get_nlocs()))
@@ -1023,26 +1121,19 @@ class MartheOptim():
         headers.append('Simulation files directory: {}'.format(self.sim_dir))
         headers.append('***')
 
-        # -- Write config file
+        # -- Gather headers, parameter and observation configuration blocks
+        blocks = [title, '\n'.join(headers)]
+        blocks.extend(mp.to_config() for mp in self.param.values())
+        blocks.extend(mo.to_config() for mo in self.obs.values())
+
+        # -- Write config file (single write)
         with open(configfile, 'w', encoding=encoding) as f:
-            # -- write headers
-            f.write(title)
-            f.write('\n'*2)
-            f.write('\n'.join(headers))
-            f.write('\n'*2)
-            # -- Write parameter configuration blocks
-            for mp in self.param.values():
-                f.write(mp.to_config())
-                f.write('\n'*2)
-            # -- Write parameter configuration block
-            for mo in self.obs.values():
-                f.write(mo.to_config())
-                f.write('\n'*2)
+            f.write(''.join(b + '\n'*2 for b in blocks))
 
 
 
 
-    def write_parfile(self, parname= None, cleanup=True):
+    def write_parfile(self, parname= None, cleanup=True, nthreads=None):
         """
         Write parameter file(s) in parameter directory (`par_dir`).
 
@@ -1057,6 +1148,11 @@ class MartheOptim():
                                    extension in `.par_dir`.
                                    Default is True. 
 
+        nthreads (int, optional) : number of threads used to write
+                                   parameter files (I/O bound).
+                                   If None, nthreads = min(32, number of parameters).
+                                   Default is None.
+
         Examples
         --------
         mopt.write_parfile(['soil', 'hk'])
@@ -1078,12 +1174,19 @@ class MartheOptim():
             err_msg = "ERROR : Some provided parameters not added yet: {}.".format(', '.join(not_found))
             assert len(not_found) == 0, err_msg
         # -- Write parameter file for each provided parameter
-        for pnme in pnmes:
-            self.param[pnme].write_parfile()
+        pnmes = list(pnmes)
+        nthreads = min(32, len(pnmes)) if nthreads is None else nthreads
+        if nthreads <= 1:
+            for pnme in pnmes:
+                self.param[pnme].write_parfile()
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=nthreads) as ex:
+                list(ex.map(lambda pnme: self.param[pnme].write_parfile(), pnmes))
 
 
 
-    def write_tplfile(self, parname= None, cleanup=True):
+    def write_tplfile(self, parname= None, cleanup=True, nthreads=None):
         """
         Write template file(s) in template directory (`tpl_dir`).
 
@@ -1098,6 +1201,11 @@ class MartheOptim():
                                    extension in `.tpl_dir`.
                                    Default is True. 
 
+        nthreads (int, optional) : number of threads used to write
+                                   template files (I/O bound).
+                                   If None, nthreads = min(32, number of parameters).
+                                   Default is None.
+
         Examples
         --------
         mopt.write_tplfile(['soil', 'hk'])
@@ -1120,8 +1228,15 @@ class MartheOptim():
             assert len(not_found) == 0, err_msg
 
         # -- Write parameter file for each provided parameter
-        for pnme in pnmes:
-            self.param[pnme].write_tplfile()
+        pnmes = list(pnmes)
+        nthreads = min(32, len(pnmes)) if nthreads is None else nthreads
+        if nthreads <= 1:
+            for pnme in pnmes:
+                self.param[pnme].write_tplfile()
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=nthreads) as ex:
+                list(ex.map(lambda pnme: self.param[pnme].write_tplfile(), pnmes))
 
 
 
@@ -1291,17 +1406,18 @@ class MartheOptim():
         # ---- Make the required ftypes file iterable
         fts = marthe_utils.make_iterable(ftypes)
         # ---- Collect pest files for each required file types
+        pnmes = list(self.param.keys())
         pest_files = []
         for ft in fts:
             # -- Template file(s)
             if any(tag == ft for tag in ['template', 'tpl_file' , 'tpl']):
                 files = [os.path.join(self.tpl_dir, f) for f in sorted(os.listdir(self.tpl_dir))
-                         if any(k in f for k in self.param.keys()) & f.endswith('.tpl')]
+                         if f.endswith('.tpl') and any(k in f for k in pnmes)]
 
             # -- Input file(s)
             if any(tag == ft for tag in ['parameter', 'in_file' , 'in' , 'par']):
                 files = [os.path.join(self.par_dir, f) for f in sorted(os.listdir(self.par_dir))
-                         if any(k in f for k in self.param.keys()) & f.endswith('.dat')]
+                         if f.endswith('.dat') and any(k in f for k in pnmes)]
 
             # -- Instruction file(s)
             if any(tag == ft for tag in ['instruction', 'ins_file', 'ins']):
@@ -1436,7 +1552,7 @@ class MartheOptim():
                     'defaultvalue':'parval1'},
                     axis=1)
             )
-        param_df['parnme'] = param_df['parnme'].str.replace('__','_')
+        param_df['parnme'] = param_df['parnme'].str.replace('__','_', regex=False)
         # am: inplace not allowed since pandas >= 2.0
         # param_df.set_index('parnme', drop = False, inplace = True)
         param_df = param_df.set_index('parnme', drop = False)
@@ -1453,7 +1569,7 @@ class MartheOptim():
 
         # -- Push to Pst 'observation_data' section
         # pyemu.pst_from_io_files() applies .lower() to observation names when reading ins files 
-        pst.observation_data.loc[obs_df.index.str.lower()] = obs_df[pst.obs_fieldnames]
+        pst.observation_data.loc[obs_df.index.str.lower()] = obs_df[pst.obs_fieldnames].astype({'obgnme': object})
 
         # -- Add regularization if required
         if add_reg0:
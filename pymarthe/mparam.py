@@ -210,6 +210,18 @@ class MartheListParam():
 
 
 
+    def get_npar(self):
+        """
+        Return number of parameters (without copying parameter data).
+
+        Examples
+        --------
+        npar = mlp.get_npar()
+        """
+        return len(self.param_df)
+
+
+
     def to_config(self):
         """
         Return the essential informations of current set of parameters to be
@@ -1108,6 +1120,24 @@ class MartheGridParam():
 
 
 
+    def get_npar(self):
+        """
+        Return number of parameters (zpc and pilot points)
+        without building the joined parameter DataFrame.
+
+        Examples
+        --------
+        npar = mgp.get_npar()
+        """
+        npar = len(self.zpc_df)
+        for pp_df in self.pp_dic.values():
+            if pp_df is not None:
+                npar += len(pp_df)
+        return npar
+
+
+
+
     def to_config(self):
         """
         Return the essential informations of current set of parameters to be
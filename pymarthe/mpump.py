@@ -587,7 +587,7 @@ class MarthePump():
             # ---- Read external file 
             df = pd.read_csv(qfilename,  delim_whitespace=True)
             # ---- Set new values
-            rec_df_ss = rec_df.query(f"istep != 0 & qfilename == '{qfilename}'")
+            rec_df_ss = rec_df[(rec_df['istep'] != 0) & (rec_df['qfilename'] == qfilename)]
             for qcol, gb in rec_df_ss.groupby('qcol'):
                 df.iloc[:,int(qcol)] = gb['value'].values
             # ---- Rewrite external file
@@ -564,6 +564,93 @@ def read_grid_file(grid_file, keep_adj=False, start=None, end=None):
         # -- Get subseted content
         content = ''.join([allcontent[s:e] for s,e in zip(starts, ends)])
 
+    # ---- Parse all grids
+    grid_list = list(parse_grid_content(content, keep_adj=keep_adj))
+
+    # ---- Raise error if marthe grid file headers are not provided
+    err_msg = f"ERROR : uncorrect headers values in `{grid_file}` grid file.\n" \
+               "Check and correct the following lines:\n" \
+               "\t-'Layer='\n" \
+               "\t-'Max_Layer='\n" \
+               "\t-'Nest_grid='\n" \
+               "\t-'Max_NestG='\n"
+    assert all(mg.layer >= 0 for mg in grid_list), err_msg
+
+    # ---- Return all MartheGrid instances and xcc, ycc if required
+    return tuple(grid_list)
+
+
+
+
+def iter_grid_file(grid_file, keep_adj=False, start=None, end=None):
+    """
+    Function to iterate over Marthe grid data in file.
+    Same as read_grid_file() but grids are parsed and yielded
+    one `start`/`end` section at a time, so that the subseted
+    content and the whole grid list are never held in memory.
+
+    Parameters:
+    ----------
+    grid_file (str) : Marthe Grid file full path
+
+    keep_adj (bool) : whatever conserving adjacent cells
+                      for nested grids.
+                      Default is False.
+
+    start/end (int, optional) : first/last character index to 
+                                consider in whole grid file.
+                                If None, `start`=0 and `end`= len(N)
+                                Default is None.
+
+    Returns:
+    --------
+    grids (generator) : MartheGrid instances.
+
+    Examples:
+    --------
+    for mg in iter_grid_file('chasim.out', start=df.start, end=df.end):
+        print(mg.array.mean())
+
+    """
+    # ---- Extract data as large string
+    with open(grid_file, 'r', encoding = encoding) as f:
+        allcontent = f.read()
+    # -- Manage start/end input 
+    starts = [0] if start is None else make_iterable(start)
+    ends = [len(allcontent)] if end is None else make_iterable(end)
+
+    # ---- Parse each section separately
+    err_msg = f"ERROR : uncorrect headers values in `{grid_file}` grid file."
+    for s, e in zip(starts, ends):
+        for mg in parse_grid_content(allcontent[s:e], keep_adj=keep_adj):
+            assert mg.layer >= 0, err_msg
+            yield mg
+
+
+
+
+def parse_grid_content(content, keep_adj=False):
+    """
+    Function to parse Marthe grid(s) from a string content.
+    Only structured grids are supported.
+
+    Parameters:
+    ----------
+    content (str) : Marthe grid file content.
+
+    keep_adj (bool) : whatever conserving adjacent cells
+                      for nested grids.
+                      Default is False.
+
+    Returns:
+    --------
+    grids (generator) : MartheGrid instances.
+
+    Examples:
+    --------
+    grids = list(parse_grid_content(content))
+
+    """
     # ---- Define data regex
     sgrid, scgrid, egrid, cxdx0, cydy0, cxdx1, cydy1 =  [r'\[Data]',
                                                          r'\[Constant_Data]',
@@ -591,8 +678,6 @@ def read_grid_file(grid_file, keep_adj=False, start=None, end=None):
     str_grids = re.findall(r, content, re.DOTALL)
 
     # ---- Iterate over each grid
-    grid_list = []
-
     for field, istep, layer, inest, xl, yl , ncol, nrow, str_grid_tup in zip(*headers, str_grids):
         # ---- Get 
         data_type, str_grid = str_grid_tup
@@ -646,20 +731,8 @@ def read_grid_file(grid_file, keep_adj=False, start=None, end=None):
             else:
                 args = (istep, layer, inest, nrow, ncol, xl, yl, dx, dy, xcc, ycc, array, field)
         # args = (istep, layer, inest, nrow, ncol, xl, yl, dx, dy, xcc, ycc, array, field)
-        # -- Append MartheGrid instance to the grid list
-        grid_list.append(pymarthe.utils.grid_utils.MartheGrid(*args))
-
-    # ---- Raise error if marthe grid file headers are not provided
-    err_msg = f"ERROR : uncorrect headers values in `{grid_file}` grid file.\n" \
-               "Check and correct the following lines:\n" \
-               "\t-'Layer='\n" \
-               "\t-'Max_Layer='\n" \
-               "\t-'Nest_grid='\n" \
-               "\t-'Max_NestG='\n"
-    assert all(mg.layer >= 0 for mg in grid_list), err_msg
-
-    # ---- Return all MartheGrid instances and xcc, ycc if required
-    return tuple(grid_list)
+        # -- Yield MartheGrid instance
+        yield pymarthe.utils.grid_utils.MartheGrid(*args)
 
 
 
@@ -1324,11 +1397,10 @@ def remove_no_data_values(df, column = 'value', nodata = NO_DATA_VALUES):
     if nodata is None:
         return df
     else:
-        # ---- Transform specific no data value to NaN
-        for nd in nodata:
-            df.loc[df[column] == nd, column] = pd.NA
+        # ---- Mask all no data values in a single pass
+        mask = np.isin(df[column].to_numpy(), make_iterable(nodata))
         # ---- Return clean DataFrame
-        return df.dropna()
+        return df[~mask].dropna()
 
 
 
@@ -1354,17 +1426,24 @@ def read_obsfile(obsfile, nodata = None):
                      Format : date          value
                               1996-05-09    0.12
                               1996-05-10    0.88
+                     Note: index is always a pd.DatetimeIndex.
 
     Examples:
     --------
     obs_df = read_obsfile(obsfile = 'myobs.dat')
     """
     # ---- Read obsfile
-    data = pd.read_csv(obsfile, delim_whitespace=True,
+    # (r'\s+' separator uses the C engine whitespace fast path,
+    #  dates are parsed once per unique string with `cache_dates`)
+    data = pd.read_csv(obsfile, sep=r'\s+',
                                 header=None, skiprows=1,
-                                index_col=0, parse_dates=True)
+                                index_col=0, parse_dates=True,
+                                cache_dates=True)
     # ---- Set standard column names
     df = data.rename(columns = {1 :'value'})
+    # ---- Ensure DatetimeIndex (dates left unparsed by read_csv are converted once)
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index, cache=True)
     df.index.name = 'date'
     # ----- Return clean DataFrame
     return remove_no_data_values(df, nodata = nodata)
@@ -3,6 +3,7 @@ import os
 import numpy as np
 import pandas as pd
 import re, ast
+from functools import lru_cache
 import pyemu
 
 from pymarthe.utils import ts_utils, marthe_utils
@@ -220,6 +221,42 @@ def transform(it, trans, fail = 'raise'):
 
 def is_valid_trans(trans):
     """
+    -----------
+    Description
+    -----------
+    Check if a transformation can be applied on numeric values
+    (tested on a basic series with transform()).
+    Checks of hashable transformations (ex: 'log10', 'lambda x: 10**x')
+    are memoized.
+
+    -----------
+    Parameters
+    -----------
+    - trans (str/func) : transformation to check.
+                         Can be a pandas string function ('log10', 'sqrt', ...),
+                         a litteral expression understood by the python
+                         built-in eval() function or a function.
+    -----------
+    Returns
+    -----------
+    valid (bool) : True if transformation is valid.
+    -----------
+    Examples
+    -----------
+    is_valid_trans('lambda x: 10**x')
+    """
+    # -- Reuse previous check of the same (hashable) transformation
+    try:
+        return _is_valid_trans(trans)
+    except TypeError:
+        return _is_valid_trans.__wrapped__(trans)
+
+
+
+@lru_cache(maxsize=32)
+def _is_valid_trans(trans):
+    """
+    Memoized implementation of is_valid_trans().
     """
     # -- Generate basic serie
     s = pd.Series(np.arange(1,3))
@@ -313,25 +350,27 @@ def compute_weight(lambda_i, lambda_n, m, n, sigma_i):
     -----------
     Description
     -----------
-    Compute weigth for a single observation
+    Compute weigth for a single observation.
+    All arguments can also be provided as numpy arrays
+    to compute weights of many observation sets at once.
     -----------
     Parameters
     -----------
-    - lambda_i (int) : tuning factor for current observation data type
+    - lambda_i (int/array) : tuning factor for current observation data type
     - lambda_n (int) : sum of all tuning factors
-    - m (int) : number of station for a given data type
-    - n (int) : number of records for a given data type at a given station
-    - sigma (float) : the expected variance between simulated and observed data
+    - m (int/array) : number of station for a given data type
+    - n (int/array) : number of records for a given data type at a given station
+    - sigma (float/array) : the expected variance between simulated and observed data
     -----------
     Returns
     -----------
-    w (float) : weight of a given observation
+    w (float/array) : weight of a given observation
     -----------
     Examples
     -----------
     w = compute_weight(lambda_i = 10, lambda_n = 14, m = 22, n = 365, sigma = 0.01)
     """
-    w = np.sqrt(lambda_i / (lambda_n  * m * n * (sigma_i**2)))
+    w = np.sqrt(np.divide(lambda_i, lambda_n * np.multiply(m, n) * np.square(sigma_i)))
     return(w)
 
 
@@ -367,16 +406,12 @@ def write_insfile(obsnmes, insfile):
     obsnmes = ['loc001n{}'.format(str(i).zfill(3)) for i in range(250)]
     write_insfile(obsnmes, insfile = 'myinsfile.ins')
     """
-    # ---- Build instruction lines
-    df = pd.DataFrame(dict(obsnme = obsnmes))
-    df['ins_line'] = df['obsnme'].apply(lambda s: 'l1 ({}){}:{}'.format(s,VAL_START,VAL_END))
-    # ---- Write formated instruction file
-    with open(insfile,'w', encoding=encoding) as f:
-        f.write('pif ~\n')
-        f.write(df.to_string(col_space=0, columns=["ins_line"],
-                             formatters=FMT_DIC, justify="left",
-                             header=False, index=False, index_names=False,
-                             max_rows = len(df), min_rows = len(df)))
+    # ---- Build whole instruction file content at once
+    fmt = 'l1 ({})' + f'{VAL_START}:{VAL_END}'
+    content = '\n'.join(['pif ~', *map(fmt.format, obsnmes)]) + '\n'
+    # ---- Write formated instruction file in a single call
+    with open(insfile, 'w', encoding=encoding) as f:
+        f.write(content)
 
 
 
@@ -455,13 +490,13 @@ def extract_prn(prn, name, dates_out=None, trans='none', interp_method = 'index'
     else:
         prn_df = marthe_utils.read_prn(prn)
 
-    # -- Manage if fluctuation
+    # -- Manage if fluctuation (source name = name without trailing suffix)
     if len(fluc_dic) == 0:
-        suffix = ''
-        validity = name in prn_df.columns.get_level_values('name')
+        src_name = name
     else:
         suffix, on = fluc_dic['tag'] + 'f', fluc_dic['on']
-        validity = name.replace(suffix,'') in prn_df.columns.get_level_values('name')
+        src_name = name[:-len(suffix)] if name.endswith(suffix) else name
+    validity = src_name in prn_df.columns.get_level_values('name')
     
     # -- Assert that the required name is in prn
     # replaced error by warning : some obs may not originated from the prn
@@ -474,7 +509,7 @@ def extract_prn(prn, name, dates_out=None, trans='none', interp_method = 'index'
         return
 
     # -- Get records by name
-    df = prn_df.xs(key=name.replace(suffix,''), level='name', axis=1)
+    df = prn_df.xs(key=src_name, level='name', axis=1)
     df.columns = ['value']
 
     # -- Tranform to fluctuation if required